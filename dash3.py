@@ -2,11 +2,18 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import numpy as np
 import warnings
 import os
+import re
+import json
+import tempfile
+import time
 
 # Supprimer les warnings
 warnings.filterwarnings("ignore")
@@ -23,36 +30,197 @@ st.set_page_config(
 # URL de l'API Lambda
 LAMBDA_URL = "https://w7e62hoex6.execute-api.us-east-1.amazonaws.com/prod/getScrapingData"
 
-@st.cache_data(ttl=300, show_spinner=False)  # Cache pendant 5 minutes
-def load_data():
-    """Charge les données depuis l'API Lambda"""
+# Compression brotli annoncée seulement si urllib3 peut la décoder
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# Session HTTP partagée : connexion TLS réutilisée et réponse compressée
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.headers["Accept-Encoding"] = _ACCEPT_ENCODING
+
+# Tout caractère non numérique (compilé une seule fois pour toutes les colonnes)
+_NONDIGIT = re.compile(r"[^0-9]")
+
+def _clean_numeric(series):
+    """Garde uniquement les chiffres d'une colonne et la convertit en entier (Arrow, int32 si possible)"""
+    arr = pa.array(series.astype('string'), type=pa.string())
+    digits = pc.replace_substring_regex(arr, pattern=_NONDIGIT.pattern, replacement="")
+    # Vide ou plus de 18 chiffres (hors de l'int64) : valeur manquante plutôt qu'une erreur
+    length = pc.utf8_length(digits)
+    digits = pc.if_else(pc.or_(pc.equal(length, 0), pc.greater(length, 18)), None, digits)
+    values = pc.cast(digits, pa.int64())
+    # Réduction en int32 quand les valeurs le permettent (deux fois moins d'octets)
+    max_value = pc.max(values).as_py()
+    if max_value is None or max_value <= np.iinfo(np.int32).max:
+        values = pc.cast(values, pa.int32())
+    return pd.Series(pd.arrays.ArrowExtensionArray(values), index=series.index, name=series.name)
+
+# Schéma connu des enregistrements renvoyés par l'API (évite l'inférence de types)
+_SCHEMA = {
+    "Source": "string",
+    "Marque": "string",
+    "Km": "string",
+    "Prix": "string",
+    "Mc": "string",
+    "Transmission": "string",
+    "Carburant": "string",
+    "Statut": "string",
+    "Etat": "string",
+    "DateScraping": "string",
+}
+
+def _records_to_frame(records):
+    """Construit le DataFrame à partir d'une liste d'enregistrements selon _SCHEMA"""
+    # Colonnes hors schéma éventuelles, déduites du premier enregistrement
+    extra = [key for key in records[0] if key not in _SCHEMA] if records else []
+    df = pd.DataFrame.from_records(records, columns=list(_SCHEMA) + extra)
+    
+    # Colonnes du schéma absentes de la réponse : supprimées plutôt que laissées vides
+    missing = df[list(_SCHEMA)].isna().all()
+    df = df.drop(columns=missing.index[missing])
+    return df.astype({col: dtype for col, dtype in _SCHEMA.items() if col in df.columns})
+
+# Cache disque : Parquet (mémoire mappée) + fichier annexe {etag, ts}
+CACHE_TTL = 300  # secondes
+PARQUET_PATH = os.path.join(tempfile.gettempdir(), "cars.parquet")
+PARQUET_META_PATH = os.path.join(tempfile.gettempdir(), "cars.json")
+
+# Colonnes textuelles à faible cardinalité
+CATEGORICAL_COLS = ("Source", "Transmission", "Carburant", "Statut", "Marque", "Etat")
+
+# Colonnes numériques nettoyées au chargement
+NUMERICAL_COLS = ("Km", "Prix", "Mc")
+
+# Onglets du tableau de bord
+TABS = ["📈 Graphiques", "📊 Statistiques", "🗂️ Données"]
+
+def _read_cache_meta():
+    """Lit le fichier annexe du cache Parquet ({} s'il est absent ou illisible)"""
+    if not os.path.exists(PARQUET_PATH):
+        return {}
+    try:
+        with open(PARQUET_META_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _atomic_write(path, write):
+    """Écrit via un fichier temporaire du même dossier puis le met en place (os.replace)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_cache_meta(etag):
+    """Enregistre l'ETag et l'horodatage du cache Parquet"""
+    def write(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "ts": time.time()}, f)
+    _atomic_write(PARQUET_META_PATH, write)
+
+def _read_parquet_cache():
+    """Relit le DataFrame depuis le cache Parquet (None et cache invalidé s'il est illisible)"""
+    try:
+        df = pd.read_parquet(PARQUET_PATH, engine="pyarrow", memory_map=True)
+    except Exception:
+        _clear_disk_cache()
+        return None
+    
+    # Catégories relues en str : même dtype "string" qu'au chargement depuis l'API
+    for col in CATEGORICAL_COLS:
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.rename_categories(df[col].cat.categories.astype('string'))
+    return df
+
+def _write_parquet_cache(df, etag):
+    """Écrit le DataFrame en Parquet (zstd) ; le cache disque reste facultatif"""
+    try:
+        _atomic_write(
+            PARQUET_PATH,
+            lambda path: df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+        )
+        _write_cache_meta(etag)
+    except Exception:
+        _clear_disk_cache()
+
+def _clear_disk_cache():
+    """Invalide le cache disque (supprime le fichier annexe)"""
     try:
-        response = requests.get(LAMBDA_URL, timeout=30)
+        os.remove(PARQUET_META_PATH)
+    except OSError:
+        pass
+
+def _fetch_payload(headers):
+    """Interroge l'API et décode le JSON directement depuis le flux (None si 304)"""
+    with _SESSION.get(LAMBDA_URL, headers=headers, timeout=30, stream=True) as response:
+        if response.status_code == 304:
+            return response, None
         response.raise_for_status()
-        data = response.json()
+        response.raw.decode_content = True
+        return response, json.load(response.raw)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)  # Cache pendant 5 minutes
+def load_data():
+    """Charge les données depuis le cache Parquet ou, à défaut, depuis l'API Lambda"""
+    try:
+        meta = _read_cache_meta()
+        if meta and time.time() - meta.get("ts", 0) < CACHE_TTL:
+            cached = _read_parquet_cache()
+            if cached is not None:
+                return cached
+            meta = {}
+
+        # Requête conditionnelle : 304 si les données n'ont pas changé
+        headers = {"If-None-Match": meta["etag"]} if meta.get("etag") else {}
+        response, data = _fetch_payload(headers)
+        if response.status_code == 304:
+            cached = _read_parquet_cache()
+            if cached is not None:
+                _write_cache_meta(meta["etag"])
+                return cached
+            # Cache illisible : nouvelle requête sans condition
+            response, data = _fetch_payload({})
 
         # Convertir en DataFrame
+        if isinstance(data, dict):
+            data = data['data'] if 'data' in data else [data]
         if isinstance(data, list):
-            df = pd.DataFrame(data)
+            df = _records_to_frame(data)
         elif isinstance(data, dict):
-            if 'data' in data:
-                df = pd.DataFrame(data['data'])
-            else:
-                df = pd.DataFrame([data])
+            df = pd.DataFrame(data)
         else:
             return pd.DataFrame()
 
         # Nettoyage des colonnes numériques
-        for col in ['Km', 'Prix', 'Mc']:
+        for col in NUMERICAL_COLS:
             if col in df.columns:
-                cleaned = df[col].astype(str).str.replace(r'[^0-9]', '', regex=True)
-                cleaned = cleaned.replace('', pd.NA)
-                df[col] = pd.to_numeric(cleaned, errors='coerce')
+                df[col] = _clean_numeric(df[col])
 
         # Conversion de la date
         if 'DateScraping' in df.columns:
             df['DateScraping'] = pd.to_datetime(df['DateScraping'], errors='coerce')
 
+        # Colonnes catégorielles : comparaisons et comptages sur les codes entiers
+        for col in CATEGORICAL_COLS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        # Version du jeu de données (conservée dans le Parquet via df.attrs)
+        etag = response.headers.get("ETag")
+        df.attrs["version"] = etag or time.time()
+        
+        _write_parquet_cache(df, etag)
         return df
 
     except requests.exceptions.RequestException as e:
@@ -62,198 +230,298 @@ def load_data():
         st.error(f"❌ Erreur lors du traitement des données: {e}")
         return pd.DataFrame()
 
+# Filtres de la sidebar : (colonne, libellé)
+FILTERS = [
+    ('Source', "📍 Source"),
+    ('Transmission', "⚙️ Transmission"),
+    ('Carburant', "⛽ Carburant"),
+    ('Statut', "📊 Statut"),
+    ('Marque', "🏷️ Marque"),
+    ('Etat', "🔧 État"),
+]
+
+def _df_fingerprint(df):
+    """Empreinte légère d'un DataFrame (sans hacher toutes les cellules)"""
+    return (len(df), tuple(df.columns), df.attrs.get("version"))
+
+def _session_memo(name, key, compute):
+    """Réutilise le résultat gardé en session tant que la clé ne change pas"""
+    cached = st.session_state.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = compute()
+    st.session_state[name] = (key, value)
+    return value
+
+# Le DataFrame est identifié par son empreinte, sans hacher chaque cellule
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _filter_options(df, cols):
+    """Listes d'options des filtres, calculées une fois par jeu de données"""
+    options = {}
+    for col in cols:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            values = df[col].cat.categories
+        else:
+            values = df[col].dropna().unique()
+        options[col] = ['Tous'] + sorted(values.tolist())
+    return options
+
+def _mask_rows(df, selections):
+    """Sélectionne les lignes correspondant à tous les filtres"""
+    # Un seul masque combiné, une seule sélection de lignes
+    mask = None
+    for col, selected in selections.items():
+        col_mask = np.asarray(df[col].values == selected, dtype=bool)
+        mask = col_mask if mask is None else mask & col_mask
+    
+    # Sans filtre actif, les données d'origine sont renvoyées sans copie
+    return df[mask] if mask is not None else df
+
 def apply_filters(df):
-    """Applique les filtres sélectionnés par l'utilisateur"""
-    filtered_df = df.copy()
-    
+    """Applique les filtres sélectionnés ; renvoie (données filtrées, clé des filtres)"""
     # Filtres dans la sidebar
     st.sidebar.header("🔍 Filtres")
     
-    # Filtre par Source
-    if 'Source' in df.columns:
-        sources = ['Tous'] + sorted(df['Source'].dropna().unique().tolist())
-        selected_source = st.sidebar.selectbox("📍 Source", sources)
-        if selected_source != 'Tous':
-            filtered_df = filtered_df[filtered_df['Source'] == selected_source]
-    
-    # Filtre par Transmission
-    if 'Transmission' in df.columns:
-        transmissions = ['Tous'] + sorted(df['Transmission'].dropna().unique().tolist())
-        selected_transmission = st.sidebar.selectbox("⚙️ Transmission", transmissions)
-        if selected_transmission != 'Tous':
-            filtered_df = filtered_df[filtered_df['Transmission'] == selected_transmission]
-    
-    # Filtre par Carburant
-    if 'Carburant' in df.columns:
-        carburants = ['Tous'] + sorted(df['Carburant'].dropna().unique().tolist())
-        selected_carburant = st.sidebar.selectbox("⛽ Carburant", carburants)
-        if selected_carburant != 'Tous':
-            filtered_df = filtered_df[filtered_df['Carburant'] == selected_carburant]
-    
-    # Filtre par Statut
-    if 'Statut' in df.columns:
-        statuts = ['Tous'] + sorted(df['Statut'].dropna().unique().tolist())
-        selected_statut = st.sidebar.selectbox("📊 Statut", statuts)
-        if selected_statut != 'Tous':
-            filtered_df = filtered_df[filtered_df['Statut'] == selected_statut]
-    
-    # Filtre par Marque
-    if 'Marque' in df.columns:
-        marques = ['Tous'] + sorted(df['Marque'].dropna().unique().tolist())
-        selected_marque = st.sidebar.selectbox("🏷️ Marque", marques)
-        if selected_marque != 'Tous':
-            filtered_df = filtered_df[filtered_df['Marque'] == selected_marque]
-    
-    # Filtre par État
-    if 'Etat' in df.columns:
-        etats = ['Tous'] + sorted(df['Etat'].dropna().unique().tolist())
-        selected_etat = st.sidebar.selectbox("🔧 État", etats)
-        if selected_etat != 'Tous':
-            filtered_df = filtered_df[filtered_df['Etat'] == selected_etat]
-    
-    
-    
-    return filtered_df
-
-def display_kpis(df):
+    available = tuple(col for col, _ in FILTERS if col in df.columns)
+    options = _filter_options(df, available)
+    
+    selections = {}
+    for col, label in FILTERS:
+        if col in df.columns:
+            selected = st.sidebar.selectbox(label, options[col])
+            if selected != 'Tous':
+                selections[col] = selected
+    
+    # Clé de la vue courante : jeu de données + filtres sélectionnés
+    filter_key = (_df_fingerprint(df), tuple(selections.items()))
+    filtered_df = _session_memo('filtered_df', filter_key, lambda: _mask_rows(df, selections))
+    return filtered_df, filter_key
+
+def _project(df, cols):
+    """Ne garde que les colonnes utiles à une vue (moins de données sérialisées)"""
+    return df[[col for col in cols if col in df.columns]]
+
+# Agrégations des KPIs : colonne -> fonction
+KPI_AGGREGATIONS = {'Prix': 'mean', 'Km': 'mean', 'Source': 'nunique'}
+
+def compute_kpis(df):
+    """Calcule les KPIs principaux (None quand un KPI n'est pas disponible)"""
+    kpis = {'total': len(df), 'prix': None, 'km': None, 'sources': None}
+    
+    # Moyennes et nombre de sources en un seul appel
+    aggregations = {col: func for col, func in KPI_AGGREGATIONS.items() if col in df.columns}
+    if not aggregations:
+        return kpis
+    results = df.agg(aggregations)
+    
+    if 'Prix' in results and not pd.isna(results['Prix']):
+        kpis['prix'] = results['Prix']
+    
+    if 'Km' in results and not pd.isna(results['Km']):
+        kpis['km'] = results['Km']
+    
+    if 'Source' in results:
+        kpis['sources'] = int(results['Source'])
+    
+    return kpis
+
+def display_kpis(kpis):
     """Affiche les KPIs principaux"""
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("🚗 Total Voitures", len(df))
+        st.metric("🚗 Total Voitures", kpis['total'])
     
     with col2:
-        if 'Prix' in df.columns and not df['Prix'].isna().all():
-            prix_moyen = df['Prix'].mean()
-            st.metric("💰 Prix Moyen", f"{prix_moyen:,.0f} MAD" if not pd.isna(prix_moyen) else "N/A")
+        if kpis['prix'] is not None:
+            st.metric("💰 Prix Moyen", f"{kpis['prix']:,.0f} MAD")
     
     with col3:
-        if 'Km' in df.columns and not df['Km'].isna().all():
-            km_moyen = df['Km'].mean()
-            st.metric("📊 KM Moyen", f"{km_moyen:,.0f}" if not pd.isna(km_moyen) else "N/A")
+        if kpis['km'] is not None:
+            st.metric("📊 KM Moyen", f"{kpis['km']:,.0f}")
     
     with col4:
-        if 'Source' in df.columns:
-            nb_sources = df['Source'].nunique()
-            st.metric("📍 Sources", nb_sources)
+        if kpis['sources'] is not None:
+            st.metric("📍 Sources", kpis['sources'])
+
+def _code_counts(series):
+    """Comptages par modalité (non triés) : np.bincount sur les codes catégoriels"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        col_counts = pd.Series(counts, index=series.cat.categories.rename(series.name), name='count')
+    else:
+        col_counts = series.value_counts(sort=False)
+    return col_counts[col_counts > 0]
+
+def _top_counts(col_counts, n):
+    """Les n modalités les plus fréquentes, par sélection partielle (égalités dans l'ordre des modalités)"""
+    values = col_counts.to_numpy()
+    if len(values) > n:
+        # Seuil du n-ième plus grand comptage, puis premières modalités à égalité
+        threshold = np.partition(values, -n)[-n]
+        above = np.flatnonzero(values > threshold)
+        tied = np.flatnonzero(values == threshold)[:n - len(above)]
+        top_idx = np.concatenate([above, tied])
+    else:
+        top_idx = np.arange(len(values))
+    top_idx = top_idx[np.lexsort((top_idx, -values[top_idx]))]
+    return col_counts.iloc[top_idx]
+
+def category_counts(df):
+    """Comptages par modalité des colonnes catégorielles, calculés une seule fois"""
+    counts = {}
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            counts[col] = _code_counts(df[col])
+    return counts
+
+def _count_bar(col_counts, title, label):
+    """Diagramme en barres à une seule trace à partir de comptages précalculés"""
+    palette = px.colors.qualitative.Plotly
+    fig = px.bar(
+        x=col_counts.index.astype(str),
+        y=col_counts.values,
+        title=title,
+        labels={'x': label, 'y': 'Nombre de voitures'}
+    )
+    fig.update_traces(marker_color=[palette[i % len(palette)] for i in range(len(col_counts))])
+    return fig
+
+# Graphiques de répartition : (colonne, titre)
+DISTRIBUTION_CHARTS = [
+    ('Source', "Nombre de voitures par Source"),
+    ('Transmission', "Nombre de voitures par transmission"),
+    ('Carburant', "Nombre de voitures par carburant"),
+    ('Etat', "Nombre de voitures par état"),
+]
 
-def display_charts(df):
+def build_charts(df, counts):
+    """Construit les figures Plotly, indexées par la colonne représentée"""
+    figs = {}
+    
+    for col, title in DISTRIBUTION_CHARTS:
+        if col in counts and not counts[col].empty:
+            figs[col] = _count_bar(counts[col], title, col)
+    
+    if 'Marque' in counts and not counts['Marque'].empty:
+        top_marques = _top_counts(counts['Marque'], 10)
+        fig = px.bar(
+            x=top_marques.index,
+            y=top_marques.values,
+            title="Top 10 des marques les plus représentées",
+            labels={'x': 'Marque', 'y': 'Nombre de voitures'}
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        figs['Marque'] = fig
+    
+    if 'DateScraping' in df.columns and not df['DateScraping'].isna().all():
+        # Grouper par jour (rééchantillonnage natif datetime64, jours sans données exclus)
+        date_counts = df[['DateScraping']].set_index('DateScraping').resample('D').size()
+        date_counts = date_counts[date_counts > 0].reset_index()
+        date_counts.columns = ['Date', 'Nombre']
+        
+        figs['DateScraping'] = px.line(
+            date_counts,
+            x='Date',
+            y='Nombre',
+            title="Évolution du nombre de voitures scrapées par date",
+            markers=True
+        )
+    
+    return figs
+
+def display_charts(figs):
     """Affiche tous les graphiques"""
     
     # Première ligne de graphiques
     col1, col2 = st.columns(2)
     
     with col1:
-        if 'Source' in df.columns and not df['Source'].isna().all():
+        if 'Source' in figs:
             st.subheader("📍 Répartition par Source")
-            source_counts = df['Source'].value_counts()
-            fig = px.histogram(
-                df,
-                x='Source',
-                title="Nombre de voitures par Source",
-                color='Source'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figs['Source'], use_container_width=True)
     
     with col2:
-        if 'Transmission' in df.columns and not df['Transmission'].isna().all():
+        if 'Transmission' in figs:
             st.subheader("⚙️ Répartition par Transmission")
-            fig = px.histogram(
-                df, 
-                x='Transmission', 
-                title="Nombre de voitures par transmission",
-                color='Transmission'
-            )
-            fig.update_layout(showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figs['Transmission'], use_container_width=True)
     
     # Deuxième ligne de graphiques
     col3, col4 = st.columns(2)
     
     with col3:
-        if 'Carburant' in df.columns and not df['Carburant'].isna().all():
+        if 'Carburant' in figs:
             st.subheader("⛽ Répartition par Carburant")
-            fig = px.histogram(
-                df, 
-                x='Carburant', 
-                title="Nombre de voitures par carburant",
-                color='Carburant'
-            )
-            fig.update_layout(showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figs['Carburant'], use_container_width=True)
     
     with col4:
-        if 'Etat' in df.columns and not df['Etat'].isna().all():
+        if 'Etat' in figs:
             st.subheader("🔧 Répartition par État")
-            fig = px.histogram(
-                df, 
-                x='Etat', 
-                title="Nombre de voitures par état",
-                color='Etat'
-            )
-            fig.update_layout(showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figs['Etat'], use_container_width=True)
     
     # Graphiques sur toute la largeur
-    if 'Marque' in df.columns and not df['Marque'].isna().all():
+    if 'Marque' in figs:
         st.subheader("🏷️ Top 10 des Marques")
-        top_marques = df['Marque'].value_counts().head(10)
-        fig = px.bar(
-            x=top_marques.index,
-            y=top_marques.values,
-            title="Top 10 des marques les plus représentées",
-            labels={'x': 'Marque', 'y': 'Nombre de voitures'}
-        )
-        fig.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figs['Marque'], use_container_width=True)
     
-    if 'DateScraping' in df.columns and not df['DateScraping'].isna().all():
+    if 'DateScraping' in figs:
         st.subheader("📅 Évolution temporelle")
-        
-        # Grouper par date
-        date_counts = df.groupby(df['DateScraping'].dt.date).size().reset_index()
-        date_counts.columns = ['Date', 'Nombre']
-        
-        fig = px.line(
-            date_counts,
-            x='Date',
-            y='Nombre',
-            title="Évolution du nombre de voitures scrapées par date",
-            markers=True
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figs['DateScraping'], use_container_width=True)
+
+def compute_statistics(df):
+    """Calcule le tableau des statistiques numériques, en table Arrow (None sans colonne exploitable)"""
+    available_cols = [col for col in NUMERICAL_COLS if col in df.columns and not df[col].isna().all()]
     
+    if not available_cols:
+        return None
     
+    # Toutes les statistiques en un seul appel
+    stats_df = df[available_cols].agg(['mean', 'median', 'std', 'min', 'max', 'count'])
+    stats_df.index = ['Moyenne', 'Médiane', 'Écart-type', 'Minimum', 'Maximum', 'Nombre de valeurs']
+    
+    # Formatage des nombres
+    stats_df = stats_df.round(2)
+    
+    # Table Arrow transmise telle quelle au navigateur (pas de conversion à l'affichage)
+    return pa.Table.from_pandas(stats_df.reset_index(names='Statistique'), preserve_index=False)
 
-def display_statistics(df):
+def display_statistics(stats_df):
     """Affiche les statistiques détaillées"""
     st.subheader("📊 Statistiques Détaillées")
     
-    numerical_cols = ['Km', 'Prix', 'Mc']
-    available_cols = [col for col in numerical_cols if col in df.columns and not df[col].isna().all()]
-    
-    if available_cols:
-        stats_df = pd.DataFrame()
-        
-        for col in available_cols:
-            stats_df[col] = [
-                df[col].mean(),
-                df[col].median(),
-                df[col].std(),
-                df[col].min(),
-                df[col].max(),
-                df[col].count()
-            ]
-        
-        stats_df.index = ['Moyenne', 'Médiane', 'Écart-type', 'Minimum', 'Maximum', 'Nombre de valeurs']
-        
-        # Formatage des nombres
-        stats_df = stats_df.round(2)
-        
-        st.dataframe(stats_df, use_container_width=True)
+    if stats_df is not None:
+        st.dataframe(stats_df, use_container_width=True, hide_index=True)
     else:
         st.info("Aucune donnée numérique disponible pour les statistiques.")
 
+def _csv_fingerprint(df):
+    """Empreinte du DataFrame filtré : version du jeu de données, lignes retenues et premières lignes"""
+    return (
+        _df_fingerprint(df),
+        int(pd.util.hash_pandas_object(df.index).sum()),
+        int(pd.util.hash_pandas_object(df.iloc[:1000], index=False).sum())
+    )
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _csv_fingerprint})
+def _csv_bytes(df):
+    """Export CSV mis en cache : n'est recalculé que si les données filtrées changent"""
+    return df.to_csv(index=False).encode()
+
+def display_category_analysis(counts):
+    """Affiche les comptages par catégorie"""
+    st.subheader("🏷️ Analyse par Catégories")
+    # Ordre d'affichage des tableaux (différent de CATEGORICAL_COLS)
+    display_order = ('Source', 'Etat', 'Transmission', 'Carburant', 'Statut', 'Marque')
+    available_cat_cols = [col for col in display_order if col in counts]
+    
+    for col in available_cat_cols:
+        if not counts[col].empty:
+            st.write(f"**{col}:**")
+            col_counts = counts[col].sort_values(ascending=False, kind='stable')
+            st.dataframe(col_counts.to_frame('Nombre'), use_container_width=True)
+            st.markdown("---")
+
 def main():
     # En-tête
     st.title("🚗 Dashboard Voitures")
@@ -271,43 +539,58 @@ def main():
     st.success(f"✅ {len(df)} voitures chargées avec succès")
     
     # Application des filtres
-    filtered_df = apply_filters(df)
+    filtered_df, filter_key = apply_filters(df)
     
     # Information sur le filtrage
     if len(filtered_df) != len(df):
         st.info(f"🔍 {len(filtered_df)} voitures correspondent aux filtres sélectionnés (sur {len(df)} total)")
     
+    # Résultats gardés en session : rien n'est recalculé si les filtres n'ont pas changé
+    def counts():
+        return _session_memo('counts', filter_key, lambda: category_counts(filtered_df))
+    
     # Affichage des KPIs
-    display_kpis(filtered_df)
+    display_kpis(_session_memo('kpis', filter_key, lambda: compute_kpis(filtered_df)))
     st.markdown("---")
     
-    # Onglets pour organiser le contenu
-    tab1, tab2, tab3 = st.tabs(["📈 Graphiques", "📊 Statistiques", "🗂️ Données"])
+    # Onglets pour organiser le contenu : seul l'onglet actif est construit
+    active_tab = st.radio(
+        "Onglet",
+        TABS,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == TABS[0]:
+        figs = _session_memo(
+            'figs',
+            filter_key,
+            lambda: build_charts(_project(filtered_df, ['DateScraping']), counts())
+        )
+        display_charts(figs)
     
-    with tab1:
-        display_charts(filtered_df)
+    elif active_tab == TABS[1]:
+        stats_df = _session_memo(
+            'stats',
+            filter_key,
+            lambda: compute_statistics(_project(filtered_df, NUMERICAL_COLS))
+        )
+        display_statistics(stats_df)
+        display_category_analysis(counts())
     
-    with tab2:
-        display_statistics(filtered_df)
-        
-        # Analyse par catégorie
-        st.subheader("🏷️ Analyse par Catégories")
-        categorical_cols = ['Source', 'Etat', 'Transmission', 'Carburant', 'Statut', 'Marque']
-        available_cat_cols = [col for col in categorical_cols if col in filtered_df.columns]
-        
-        for col in available_cat_cols:
-            if not filtered_df[col].isna().all():
-                st.write(f"**{col}:**")
-                category_counts = filtered_df[col].value_counts()
-                st.dataframe(category_counts.to_frame('Nombre'), use_container_width=True)
-                st.markdown("---")
-    
-    with tab3:
+    else:
         st.subheader("🗂️ Données Brutes")
-        st.dataframe(filtered_df, use_container_width=True)
+        visible_cols = st.multiselect(
+            "Colonnes affichées",
+            list(filtered_df.columns),
+            default=list(filtered_df.columns)
+        )
+        raw_table = pa.Table.from_pandas(_project(filtered_df, visible_cols), preserve_index=False)
+        st.dataframe(raw_table, use_container_width=True)
         
         # Bouton de téléchargement
-        csv = filtered_df.to_csv(index=False)
+        csv = _csv_bytes(filtered_df)
         st.download_button(
             label="📥 Télécharger les données filtrées (CSV)",
             data=csv,
@@ -322,6 +605,7 @@ def main():
     
     if st.sidebar.button("🔄 Actualiser les données"):
         st.cache_data.clear()
+        _clear_disk_cache()
         st.rerun()
     st.sidebar.subheader("created by ghizlane chtouki")
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+import pandas as pd
+
+from dash3 import _clean_numeric
+
+
+def test_clean_numeric_keeps_digits_only():
+    cleaned = _clean_numeric(pd.Series(["120 000 km", "95.000 DH", None, "abc"]))
+    assert cleaned.iloc[0] == 120000
+    assert cleaned.iloc[1] == 95000
+    assert cleaned.iloc[2:].isna().all()
+
+
+def test_clean_numeric_overlong_value_becomes_missing():
+    cleaned = _clean_numeric(pd.Series(["99999999999999999999999", "80 000"]))
+    assert pd.isna(cleaned.iloc[0])
+    assert cleaned.iloc[1] == 80000
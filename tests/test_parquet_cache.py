@@ -0,0 +1,15 @@
+import pandas as pd
+
+import dash3
+
+
+def test_parquet_cache_keeps_fresh_load_dtypes(tmp_path, monkeypatch):
+    monkeypatch.setattr(dash3, "PARQUET_PATH", str(tmp_path / "cars.parquet"))
+    df = dash3._records_to_frame([{"Source": "avito", "Km": "1 000"}, {"Source": None, "Km": None}])
+    df["Km"] = dash3._clean_numeric(df["Km"])
+    df["Source"] = df["Source"].astype("category")
+    df.to_parquet(dash3.PARQUET_PATH, engine="pyarrow", index=False)
+
+    cached = dash3._read_parquet_cache()
+
+    pd.testing.assert_frame_equal(cached, df)
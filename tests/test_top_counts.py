@@ -0,0 +1,24 @@
+import pandas as pd
+
+from dash3 import _top_counts
+
+
+def test_top_counts_ties_at_cutoff_follow_category_order():
+    counts = pd.Series([5, 2, 7, 2, 2, 9], index=list("abcdef"))
+    assert list(_top_counts(counts, 4).items()) == [("f", 9), ("c", 7), ("a", 5), ("b", 2)]
+
+
+def test_top_counts_matches_stable_sort_when_ties_straddle_tenth_place():
+    counts = pd.Series([3] * 5 + [1] * 8 + [4] * 7, index=[f"m{i:02d}" for i in range(20)])
+    expected = counts.sort_values(ascending=False, kind="stable").head(10)
+    assert list(_top_counts(counts, 10).index) == list(expected.index)
+
+
+def test_top_counts_n_larger_than_counts_sorts_everything():
+    counts = pd.Series([1, 3, 3, 2], index=list("abcd"))
+    assert list(_top_counts(counts, 10).index) == ["b", "c", "d", "a"]
+    assert list(_top_counts(counts, 4).index) == ["b", "c", "d", "a"]
+
+
+def test_top_counts_empty_input():
+    assert _top_counts(pd.Series([], dtype="int64"), 10).empty